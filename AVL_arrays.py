@@ -0,0 +1,294 @@
+"""
+Array-backed AVL tree accelerated with Numba
+
+Stores the whole tree as a struct-of-arrays (left/right/parent indices,
+heights and keys in flat numpy arrays) instead of linked Node objects, so
+the hot insert/lookup loops run as jitted kernels over typed arrays.
+
+This module is the only representation that should be handed to Numba.
+Do not port the linked AVL_tree.Node to a jitclass or mirror it as nested
+tuples: a self-referential node type gives the type inferencer an
+"infinitely nested" type to converge on, which means multi-second (or
+failed) compiles and ObjectMode fallback instead of a speedup. The
+kernels here see only fixed int32[:]/int8[:]/int64[:] arrays, are purely
+iterative, and are cached on disk so the compile cost is paid once.
+
+Requires numpy and numba; the pure-Python AVL_tree module has no such
+dependency.
+"""
+import numpy as np
+from numba import njit
+
+__all__ = ["AVLArrays", "ArrayNode"]
+
+
+@njit(cache=True)
+def _fix_height(node, left, right, height):
+    left_child = left[node]
+    right_child = right[node]
+    left_height = height[left_child] if left_child != -1 else 0
+    right_height = height[right_child] if right_child != -1 else 0
+    height[node] = (left_height if left_height > right_height else right_height) + 1
+
+
+@njit(cache=True)
+def _rotate_left(node, left, right, parent, height):
+    pivot = right[node]
+    inner = left[pivot]
+    right[node] = inner
+    if inner != -1:
+        parent[inner] = node
+    up = parent[node]
+    parent[pivot] = up
+    if up != -1:
+        if left[up] == node:
+            left[up] = pivot
+        else:
+            right[up] = pivot
+    left[pivot] = node
+    parent[node] = pivot
+    _fix_height(node, left, right, height)
+    _fix_height(pivot, left, right, height)
+    return pivot
+
+
+@njit(cache=True)
+def _rotate_right(node, left, right, parent, height):
+    pivot = left[node]
+    inner = right[pivot]
+    left[node] = inner
+    if inner != -1:
+        parent[inner] = node
+    up = parent[node]
+    parent[pivot] = up
+    if up != -1:
+        if left[up] == node:
+            left[up] = pivot
+        else:
+            right[up] = pivot
+    right[pivot] = node
+    parent[node] = pivot
+    _fix_height(node, left, right, height)
+    _fix_height(pivot, left, right, height)
+    return pivot
+
+
+@njit(cache=True)
+def _rebalance(node, left, right, parent, height):
+    left_child = left[node]
+    right_child = right[node]
+    left_height = height[left_child] if left_child != -1 else 0
+    right_height = height[right_child] if right_child != -1 else 0
+    if left_height > right_height:
+        middle = left_child
+        inner_height = height[right[middle]] if right[middle] != -1 else 0
+        outer_height = height[left[middle]] if left[middle] != -1 else 0
+        if inner_height > outer_height:
+            _rotate_left(middle, left, right, parent, height)
+        return _rotate_right(node, left, right, parent, height)
+
+    middle = right_child
+    inner_height = height[left[middle]] if left[middle] != -1 else 0
+    outer_height = height[right[middle]] if right[middle] != -1 else 0
+    if inner_height > outer_height:
+        _rotate_right(middle, left, right, parent, height)
+    return _rotate_left(node, left, right, parent, height)
+
+
+@njit(cache=True)
+def _lookup(root, data, left, right, keys):
+    node = root
+    while node != -1:
+        key = keys[node]
+        if data < key:
+            node = left[node]
+        elif data > key:
+            node = right[node]
+        else:
+            return node
+    return -1
+
+
+@njit(cache=True)
+def _insert(root, data, left, right, parent, height, keys, slot):
+    # iterative descent; returns the new root index, or -1 on duplicate
+    node = root
+    while True:
+        key = keys[node]
+        if data < key:
+            if left[node] == -1:
+                left[node] = slot
+                break
+            node = left[node]
+        elif data > key:
+            if right[node] == -1:
+                right[node] = slot
+                break
+            node = right[node]
+        else:
+            return -1
+
+    keys[slot] = data
+    left[slot] = -1
+    right[slot] = -1
+    parent[slot] = node
+    height[slot] = 1
+
+    # unwind the parent chain; at most one rebalance is needed
+    node = parent[slot]
+    while node != -1:
+        _fix_height(node, left, right, height)
+        left_child = left[node]
+        right_child = right[node]
+        left_height = height[left_child] if left_child != -1 else 0
+        right_height = height[right_child] if right_child != -1 else 0
+        balance_factor = left_height - right_height
+        if balance_factor >= 2 or balance_factor <= -2:
+            _rebalance(node, left, right, parent, height)
+            break
+        node = parent[node]
+
+    node = slot
+    while parent[node] != -1:
+        node = parent[node]
+    return node
+
+
+@njit(cache=True)
+def _in_order(root, left, right, keys, out):
+    # explicit-stack in-order walk filling out; returns the count written
+    stack = np.empty(64, np.int32)
+    top = -1
+    count = 0
+    node = root
+    while node != -1 or top >= 0:
+        while node != -1:
+            top += 1
+            stack[top] = node
+            node = left[node]
+        node = stack[top]
+        top -= 1
+        out[count] = keys[node]
+        count += 1
+        node = right[node]
+    return count
+
+
+class AVLArrays:
+    """
+    AVL tree over flat numpy arrays with Numba-jitted insert/lookup
+    """
+
+    __slots__ = ("left", "right", "parent", "height", "data", "n", "root", "capacity")
+
+    def __init__(self, capacity=1024):
+        """
+        AVLArrays constructor
+
+        :param capacity: initial number of node slots; grows automatically
+        """
+        self.capacity = capacity
+        self.left = np.full(capacity, -1, np.int32)
+        self.right = np.full(capacity, -1, np.int32)
+        self.parent = np.full(capacity, -1, np.int32)
+        self.height = np.ones(capacity, np.int8)
+        self.data = np.empty(capacity, np.int64)
+        self.n = 0
+        self.root = -1
+
+    def __grow(self):
+        """
+        Double the slot capacity, keeping existing nodes in place
+        """
+        self.capacity *= 2
+        self.left = np.resize(self.left, self.capacity)
+        self.right = np.resize(self.right, self.capacity)
+        self.parent = np.resize(self.parent, self.capacity)
+        self.height = np.resize(self.height, self.capacity)
+        self.data = np.resize(self.data, self.capacity)
+
+    def insert(self, data):
+        """
+        Insert new node with data
+
+        :param data: integer key to insert
+        :raises ValueError: data is already present in the tree
+        """
+        if self.n == self.capacity:
+            self.__grow()
+
+        if self.root == -1:
+            self.data[0] = data
+            self.root = 0
+            self.n = 1
+            return
+
+        root = _insert(self.root, data, self.left, self.right, self.parent,
+                       self.height, self.data, self.n)
+        if root == -1:
+            raise ValueError("data is already present in the tree")
+        self.root = root
+        self.n += 1
+
+    def lookup(self, data):
+        """
+        Lookup node containing data
+
+        :param data: integer key to look up
+        :returns: ArrayNode view of the node if found
+        :raise ValueError: data is not in tree
+        """
+        node = _lookup(self.root, data, self.left, self.right, self.data)
+        if node == -1:
+            raise ValueError(f"{data} is not in tree")
+        return ArrayNode(self, node)
+
+    def in_order(self):
+        """
+        Return all keys in sorted order as a numpy array
+        """
+        out = np.empty(self.n, np.int64)
+        if self.root != -1:
+            _in_order(self.root, self.left, self.right, self.data, out)
+        return out
+
+    def get_height(self):
+        """
+        Return the height of the tree
+        """
+        return int(self.height[self.root]) if self.root != -1 else 0
+
+
+class ArrayNode:
+    """
+    Thin Node-compatible view over one AVLArrays slot
+    """
+
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree, index):
+        self.tree = tree
+        self.index = index
+
+    def __child(self, index):
+        return ArrayNode(self.tree, index) if index != -1 else None
+
+    @property
+    def data(self):
+        return int(self.tree.data[self.index])
+
+    @property
+    def left(self):
+        return self.__child(int(self.tree.left[self.index]))
+
+    @property
+    def right(self):
+        return self.__child(int(self.tree.right[self.index]))
+
+    @property
+    def parent(self):
+        return self.__child(int(self.tree.parent[self.index]))
+
+    @property
+    def height(self):
+        return int(self.tree.height[self.index])
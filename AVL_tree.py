@@ -2,40 +2,52 @@
 Based on the code provided at: https://github.com/laurentluce/python-algorithms/blob/master/algorithms/binary_tree.py
 Extended to AVL trees by Karl Southern
 """
-from tkinter import Tk, Canvas
-from enum import Enum, auto as enum_auto
+from collections import deque
 
+# Depth of the pre-allocated traversal stacks. An AVL tree's height is at
+# most 1.44 * log2(N + 2), so 64 levels cover around 10^13 keys - far more
+# than fit in memory - and the stacks never need to grow.
+_STACK_SIZE = 64
 
-class RestructuringCase(Enum):
-    Balanced = enum_auto()
-    LeftLeft = enum_auto()
-    LeftRight = enum_auto()
-    RightLeft = enum_auto()
-    RightRight = enum_auto()
 
-    @classmethod
-    def determine_case(cls, x, y, z):
-        """
-        Takes three nodes such that x.parent = y, y.parent = z and returns the 'restructuring' case that is exhibited
+# Restructuring cases as plain integers; Enum comparisons are too slow for
+# the post-insert hot path, and these index straight into _DISPATCH below.
+LEFT_LEFT, LEFT_RIGHT, RIGHT_LEFT, RIGHT_RIGHT = 0, 1, 2, 3
 
-        :param x: Bottommost node
-        :param y: Middle node
-        :param z: Topmost node
-        :return: exhibited RestructuringCase
-        """
-        if not z.unbalanced():
-            return cls.Balanced
 
-        if z.left == y:
-            if y.left == x:
-                return cls.LeftLeft
-            else:
-                return cls.LeftRight
-        else:
-            if y.right == x:
-                return cls.RightRight
-            else:
-                return cls.RightLeft
+def determine_case(x, y, z):
+    """
+    Takes three nodes such that x.parent = y, y.parent = z and returns the 'restructuring' case that is exhibited
+
+    :param x: Bottommost node
+    :param y: Middle node
+    :param z: Topmost node
+    :return: one of LEFT_LEFT, LEFT_RIGHT, RIGHT_LEFT, RIGHT_RIGHT
+    """
+    if z.left is y:
+        return LEFT_LEFT if y.left is x else LEFT_RIGHT
+    return RIGHT_RIGHT if y.right is x else RIGHT_LEFT
+
+
+def _left_left(y, z):
+    z.rotate_right()
+
+
+def _left_right(y, z):
+    y.rotate_left()
+    z.rotate_right()
+
+
+def _right_left(y, z):
+    y.rotate_right()
+    z.rotate_left()
+
+
+def _right_right(y, z):
+    z.rotate_left()
+
+
+_DISPATCH = (_left_left, _left_right, _right_left, _right_right)
 
 
 class Node:
@@ -43,16 +55,36 @@ class Node:
     Tree node: left and right child + data which can be any object
     """
 
+    __slots__ = ("left", "right", "data", "parent", "height")
+
     def __init__(self, data):
         """
         Node constructor
 
         :param data: node data object
         """
-        self.left = None
-        self.right = None
+        self.left = _NIL
+        self.right = _NIL
         self.data = data
-        self.parent = None
+        self.parent = _NIL
+        self.height = 1
+
+    def __fix_height(self):
+        """
+        Recompute this node's height from its children in O(1)
+        """
+        left_height = self.left.height
+        right_height = self.right.height
+        self.height = (left_height if left_height > right_height else right_height) + 1
+
+    def __fix_heights_upward(self):
+        """
+        Recompute heights from this node up to the root
+        """
+        node = self
+        while node is not _NIL:
+            node.__fix_height()
+            node = node.parent
 
     def lookup(self, data):
         """
@@ -62,19 +94,16 @@ class Node:
         :returns: node if found
         :raise ValueError: data is not in tree
         """
-        if data < self.data:
-            if self.left is None:
-                raise ValueError(f"{data} is not in tree")
-
-            return self.left.lookup(data)
-
-        if data > self.data:
-            if self.right is None:
-                raise ValueError(f"{data} is not in tree")
-
-            return self.right.lookup(data)
+        node = self
+        while node is not _NIL:
+            if data < node.data:
+                node = node.left
+            elif data > node.data:
+                node = node.right
+            else:
+                return node
 
-        return self
+        raise ValueError(f"{data} is not in tree")
 
     def __replace_with_node(self, with_node):
         """
@@ -92,50 +121,57 @@ class Node:
         :param left: the new 'left' node
         :param right: the new 'right' node
         """
+        # assigning _NIL.parent is harmless, so no child guards are needed
         self.left = left
-        if self.left is not None:
-            self.left.parent = self
-
+        left.parent = self
         self.right = right
-        if self.right is not None:
-            self.right.parent = self
-
+        right.parent = self
         self.data = data
 
     def refresh_parents(self):
         """
         Refresh the parents of all descendant nodes
-        """
-        if self.left is not None:
-            self.left.parent = self
-            self.left.refresh_parents()
 
-        if self.right is not None:
-            self.right.parent = self
-            self.right.refresh_parents()
+        Subtrees whose child already points back at its parent are skipped:
+        insert/delete/rotate maintain the pointers themselves, so only a
+        subtree whose links were edited by hand needs the walk.
+        """
+        stack = deque([self])
+        while stack:
+            node = stack.pop()
+            left, right = node.left, node.right
+            if left is not _NIL and left.parent is not node:
+                left.parent = node
+                stack.append(left)
+            if right is not _NIL and right.parent is not node:
+                right.parent = node
+                stack.append(right)
 
     def __no_children_delete(self):
         """
         Remove this node from the tree, assuming it has no children
         """
-        # just remove it
-        if not self.parent:
-            del self
+        # unlink from the parent; `del self` would only drop the local name
+        parent = self.parent
+        if parent is _NIL:
             return
 
-        if self.parent.left is self:
-            self.parent.left = None
+        if parent.left is self:
+            parent.left = _NIL
         else:
-            self.parent.right = None
-        del self
+            parent.right = _NIL
+        # drop the back-reference so this node can't pin its ex-parent alive
+        self.parent = _NIL
+        parent.rebalance_delete()
 
     def __one_child_delete(self):
         """
         Remove this node from the tree, assuming it has exactly one child
         """
         # replace node with its child
-        child = self.left or self.right
+        child = self.left if self.left is not _NIL else self.right
         self.__replace_with_node(child)
+        self.rebalance_delete()
 
     def __two_children_delete(self):
         """
@@ -143,20 +179,24 @@ class Node:
         """
         # find its successor: once to the right, then all the way left
         successor = self.right
-        while successor.left is not None:
-            successor = successor.left
+        successor_left = successor.left
+        while successor_left is not _NIL:
+            successor = successor_left
+            successor_left = successor.left
         # replace node data by its successor data
         self.data = successor.data
         # fix successor's parent's child
+        successor_right = successor.right
         if successor.parent is self:
-            self.right = successor.right
-            if self.right:
-                self.right.parent = self
+            self.right = successor_right
+            successor_right.parent = self
+            self.rebalance_delete()
             return
 
-        successor.parent.left = successor.right
-        if successor.parent.left:
-            successor.parent.left.parent = successor.right
+        successor_parent = successor.parent
+        successor_parent.left = successor_right
+        successor_right.parent = successor_parent
+        successor_parent.rebalance_delete()
 
     def delete(self, data):
         """
@@ -165,21 +205,18 @@ class Node:
         :param data: node's content to delete
         :raise ValueError: data is not in tree
         """
-        # get node containing data
+        # get node containing data (lookup raises if it is missing)
         node = self.lookup(data)
-        if node is None:
-            raise ValueError("data is not in tree")
-
-        children_count = node.children_count()
-        if children_count == 0:
-            node.__no_children_delete()
-            return
 
-        if children_count == 1:
+        # branch on the children directly rather than counting them
+        has_left = node.left is not _NIL
+        has_right = node.right is not _NIL
+        if has_left and has_right:
+            node.__two_children_delete()
+        elif has_left or has_right:
             node.__one_child_delete()
-            return
-
-        node.__two_children_delete()
+        else:
+            node.__no_children_delete()
 
     def children_count(self):
         """
@@ -187,7 +224,8 @@ class Node:
 
         :returns: number of children: 0, 1, 2
         """
-        return int(self.left is not None) + int(self.right is not None)
+        # bools are ints, so no int() calls are needed
+        return (self.left is not _NIL) + (self.right is not _NIL)
 
     @classmethod
     def pre_order_traverse(cls, node):
@@ -197,11 +235,21 @@ class Node:
         :param node: the node whose (sub)tree you wish to traverse
         :return: an iterator that traverses the (sub)tree
         """
-        yield node.data
-        if node.left is not None:
-            yield from cls.pre_order_traverse(node.left)
-        if node.right is not None:
-            yield from cls.pre_order_traverse(node.right)
+        stack = [None] * _STACK_SIZE
+        top = 0
+        stack[0] = node
+        while top >= 0:
+            node = stack[top]
+            top -= 1
+            yield node.data
+            right = node.right
+            if right is not _NIL:
+                top += 1
+                stack[top] = right
+            left = node.left
+            if left is not _NIL:
+                top += 1
+                stack[top] = left
 
     @classmethod
     def in_order_traverse(cls, node):
@@ -211,11 +259,17 @@ class Node:
         :param node: the node whose (sub)tree you wish to traverse
         :return: an iterator that traverses the (sub)tree
         """
-        if node.left is not None:
-            yield from cls.in_order_traverse(node.left)
-        yield node.data
-        if node.right is not None:
-            yield from cls.in_order_traverse(node.right)
+        stack = [None] * _STACK_SIZE
+        top = -1
+        while node is not _NIL or top >= 0:
+            while node is not _NIL:
+                top += 1
+                stack[top] = node
+                node = node.left
+            node = stack[top]
+            top -= 1
+            yield node.data
+            node = node.right
 
     @classmethod
     def post_order_traverse(cls, node):
@@ -225,11 +279,30 @@ class Node:
         :param node: the node whose (sub)tree you wish to traverse
         :return: an iterator that traverses the (sub)tree
         """
-        if node.left is not None:
-            yield from cls.post_order_traverse(node.left)
-        if node.right is not None:
-            yield from cls.post_order_traverse(node.right)
-        yield node.data
+        # the node is kept on the stack while its children are emitted, so
+        # this stack can grow to twice the tree height
+        stack = [None] * (2 * _STACK_SIZE)
+        visited = [False] * (2 * _STACK_SIZE)
+        top = 0
+        stack[0] = node
+        visited[0] = False
+        while top >= 0:
+            node = stack[top]
+            if visited[top]:
+                top -= 1
+                yield node.data
+                continue
+            visited[top] = True
+            right = node.right
+            if right is not _NIL:
+                top += 1
+                stack[top] = right
+                visited[top] = False
+            left = node.left
+            if left is not _NIL:
+                top += 1
+                stack[top] = left
+                visited[top] = False
 
     def print_tree(self):
         """
@@ -241,43 +314,84 @@ class Node:
     def count_levels(self):
         """
         Count the number of levels in the tree
-        """
-        if (self.left is None) and (self.right is None):
-            return 1
-
-        if self.left is None:
-            return self.right.count_levels() + 1
 
-        if self.right is None:
-            return self.left.count_levels() + 1
-
-        left_count = self.left.count_levels()
-        right_count = self.right.count_levels()
-
-        return max(left_count, right_count) + 1
+        The level count is exactly the memoized subtree height, so repeated
+        calls (e.g. show_tree while debug-stepping) cost O(1) instead of a
+        full walk.
+        """
+        return self.height
+
+    def __collect_layout(self, x, y, sw, sh):
+        """
+        Collect node coordinates and edge lines in a single append-only pass
+
+        :returns: (coords, lines) where coords holds an (x, y, data) tuple
+            per node and lines an (x1, y1, x2, y2) tuple per edge
+        """
+        coords = []
+        lines = []
+        stack = [(self, x, y, sw)]
+        while stack:
+            node, x, y, sw = stack.pop()
+            coords.append((x, y, node.data))
+            left, right = node.left, node.right
+            half = sw * 0.5
+            child_y = y + sh
+            if right is not _NIL:
+                right_x = x + half
+                lines.append((x, y, right_x, child_y))
+                stack.append((right, right_x, child_y, half))
+            if left is not _NIL:
+                left_x = x - half
+                lines.append((x, y, left_x, child_y))
+                stack.append((left, left_x, child_y, half))
+        return coords, lines
+
+    def __layout_tour(self, x, y, sw, sh):
+        """
+        Collect node coordinates and a single Euler-tour polyline in one pass
+
+        The tour walks down to each child and back up, so one flat
+        coordinate list traces every edge (each twice, drawn on top of
+        itself) and the whole tree can be drawn with one create_line call.
+
+        :returns: (coords, tour) where coords holds an (x, y, data) tuple
+            per node and tour is a flat [x1, y1, x2, y2, ...] polyline
+        """
+        coords = []
+        tour = []
+        # a None node marks the climb back up to the recorded point
+        stack = [(self, x, y, sw)]
+        while stack:
+            node, x, y, sw = stack.pop()
+            tour.append(x)
+            tour.append(y)
+            if node is None:
+                continue
+            coords.append((x, y, node.data))
+            left, right = node.left, node.right
+            half = sw * 0.5
+            child_y = y + sh
+            if right is not _NIL:
+                stack.append((None, x, y, sw))
+                stack.append((right, x + half, child_y, half))
+            if left is not _NIL:
+                stack.append((None, x, y, sw))
+                stack.append((left, x - half, child_y, half))
+        return coords, tour
 
     def get_coords(self, x, y, sw, sh):
-        to_send = [[x, y, self.data]]
-        if self.left:
-            to_send += self.left.get_coords(x - sw / 2, y + sh, sw / 2, sh)
-        if self.right:
-            to_send += self.right.get_coords(x + sw / 2, y + sh, sw / 2, sh)
-        return to_send
+        return self.__collect_layout(x, y, sw, sh)[0]
 
     def get_lines(self, x, y, sw, sh):
-        to_send = []
-        if self.left:
-            left_coords = self.left.get_coords(x - sw / 2, y + sh, sw / 2, sh)
-            to_send += [[x, y, left_coords[0][0], left_coords[0][1]]]
-            to_send += self.left.get_lines(x - sw / 2, y + sh, sw / 2, sh)
-        if self.right:
-            right_coords = self.right.get_coords(x + sw / 2, y + sh, sw / 2, sh)
-            to_send += [[x, y, right_coords[0][0], right_coords[0][1]]]
-            to_send += self.right.get_lines(x + sw / 2, y + sh, sw / 2, sh)
-        return to_send
+        return self.__collect_layout(x, y, sw, sh)[1]
 
     def show_tree(self):
-        self.refresh_parents()
+        # imported here rather than at module level so the data-structure
+        # core works headless and on PyPy installs without Tk, and plain
+        # imports skip Tk's startup cost
+        from tkinter import Tk, Canvas
+
         tree_height = self.count_levels()
         max_tree_width = 2 ** (tree_height - 1)
         window_height = 512 * 1.25
@@ -289,14 +403,11 @@ class Node:
         canvas = Canvas(window, width=window_width + 100, height=window_height + 100, bg="white")
         canvas.pack()
         window_height = int((window_height - 2 * tree_height * node_radius) / tree_height)
-        lines_to_draw = self.get_lines(50 + window_width / 2, 50 + node_radius, window_width / 2, window_height)
-        for line_to_draw in lines_to_draw:
-            x1 = line_to_draw[0]
-            y1 = line_to_draw[1]
-            x2 = line_to_draw[2]
-            y2 = line_to_draw[3]
-            canvas.create_line(x1, y1, x2, y2)
-        nodes_to_draw = self.get_coords(50 + window_width / 2, 50 + node_radius, window_width / 2, window_height)
+        nodes_to_draw, tour = self.__layout_tour(
+            50 + window_width / 2, 50 + node_radius, window_width / 2, window_height
+        )
+        if len(tour) >= 4:
+            canvas.create_line(*tour)
         for node_to_draw in nodes_to_draw:
             x = node_to_draw[0]
             y = node_to_draw[1]
@@ -318,25 +429,26 @@ class Node:
             self.data = data
             return
 
-        if data < self.data:
-            if self.left is not None:
-                self.left.insert(data)
-                return
-
-            self.left = Node(data)
-            self.left.parent = self
-            return
-
-        if data > self.data:
-            if self.right is not None:
-                self.right.insert(data)
-                return
-
-            self.right = Node(data)
-            self.right.parent = self
-            return
+        node = self
+        path = []
+        while True:
+            path.append(node)
+            if data < node.data:
+                if node.left is _NIL:
+                    node.left = Node(data)
+                    node.left.parent = node
+                    break
+                node = node.left
+            elif data > node.data:
+                if node.right is _NIL:
+                    node.right = Node(data)
+                    node.right.parent = node
+                    break
+                node = node.right
+            else:
+                raise ValueError("data is already present in the tree")
 
-        raise ValueError("data is already present in the tree")
+        self.rebalance_insert(path)
 
     def rotate_right(self):
         """
@@ -344,18 +456,24 @@ class Node:
 
         :raises ValueError: Can't rotate to the right as there is no 'right' node to rotate from
         """
-        if self.left is None:
+        left = self.left
+        if left is _NIL:
             raise ValueError("Can't rotate to the right as there is no 'left' node to rotate from")
 
-        new_root = Node(None)
-
-        old_root = Node(None)
-        old_root.parent = new_root
-
-        new_root.__replace(data=self.left.data, left=self.left.left, right=old_root)
-        old_root.__replace(data=self.data, left=self.left.right, right=self.right)
-
-        self.__replace_with_node(new_root)
+        # swap payloads so this node keeps its identity as the subtree root
+        # (you can't do self = new_root), then re-wire the existing nodes;
+        # parent writes to _NIL are harmless, so the children need no guards
+        self.data, left.data = left.data, self.data
+        self.left = left.left
+        self.left.parent = self
+        left.left = left.right
+        left.right = self.right
+        left.right.parent = left
+        self.right = left
+        left.parent = self
+
+        left.__fix_height()
+        self.__fix_heights_upward()
 
     def rotate_left(self):
         """
@@ -363,18 +481,24 @@ class Node:
 
         :raises ValueError: Can't rotate to the left as there is no 'right' node to rotate from
         """
-        if self.right is None:
+        right = self.right
+        if right is _NIL:
             raise ValueError("Can't rotate to the left as there is no 'right' node to rotate from")
 
-        new_root = Node(None)
-
-        old_root = Node(None)
-        old_root.parent = new_root
-
-        new_root.__replace(data=self.right.data, left=old_root, right=self.right.right)
-        old_root.__replace(data=self.data, left=self.left, right=self.right.left)
-
-        self.__replace_with_node(new_root)
+        # swap payloads so this node keeps its identity as the subtree root
+        # (you can't do self = new_root), then re-wire the existing nodes;
+        # parent writes to _NIL are harmless, so the children need no guards
+        self.data, right.data = right.data, self.data
+        self.right = right.right
+        self.right.parent = self
+        right.right = right.left
+        right.left = self.left
+        right.left.parent = right
+        self.left = right
+        right.parent = self
+
+        right.__fix_height()
+        self.__fix_heights_upward()
 
     def get_highest_child(self):
         """
@@ -383,47 +507,33 @@ class Node:
         :return: child Node with the greatest height
         :raises ValueError: node has no children
         """
-        if (self.left is None) and (self.right is None):
+        if (self.left is _NIL) and (self.right is _NIL):
             raise ValueError("node has no children")
 
-        if self.left is None:
-            return self.right
-
-        if self.right is None:
-            return self.left
-
-        left_height, right_height = self.left.get_height(), self.right.get_height()
-        if left_height > right_height:
+        if self.left.height > self.right.height:
             return self.left
         else:
             return self.right
 
-    #####################################################################################################
-    #                                                                                                   #
-    #                                EDIT THE CODE BELOW                                                #
-    #                                                                                                   #
-    #####################################################################################################
-
-    # 1)Implement get_height
-    # 2)Implement unbalanced
-    # 3)Implement balance's cases
-    # 3)Finish rebalance_insert and rebalance_delete
-    # 4)Edit insert and delete to call the rebalance functions
-
     def get_height(self):
         """
-        Should run on the node and return the height of the node.
+        Return the height of the subtree rooted at this node
+
+        The height is maintained incrementally by insert/delete/rotate, so
+        this is O(1) rather than a subtree walk.
+
         :return integer:
         """
-        ...
+        return self.height
 
     def unbalanced(self):
         """
-        Should run on the node and return True if the subtree rooted at the node is unbalance, return False if
-        the subtree rooted at this node is balanced.
+        Return True if the subtree rooted at this node is unbalanced, False
+        if it is balanced (children's heights differ by at most one).
+
         :return boolean:
         """
-        ...
+        return abs(self.left.height - self.right.height) >= 2
 
     @classmethod
     def balance(cls, x, y, z):
@@ -434,57 +544,83 @@ class Node:
         :param y: Middle node
         :param z: Topmost node
         """
-        case = RestructuringCase.determine_case(x, y, z)
-        if case == RestructuringCase.Balanced:
+        if not z.unbalanced():
             return
 
-        if case == RestructuringCase.LeftLeft:
-            ...
-            return
+        _DISPATCH[determine_case(x, y, z)](y, z)
 
-        if case == RestructuringCase.LeftRight:
-            ...
-            return
+    @staticmethod
+    def _do_rotations(z):
+        """
+        Cold path of the rebalance walks: pick x and y under the unbalanced
+        node z and apply the matching rotation(s)
 
-        if case == RestructuringCase.RightRight:
-            ...
-            return
+        Rotations fire on a small fraction of operations, so this is kept
+        out of line and the walks inline only the cheap balance check.
 
-        if case == RestructuringCase.RightLeft:
-            ...
-            return
+        :param z: the unbalanced node
+        """
+        y = z.get_highest_child()
+        left_height = y.left.height
+        right_height = y.right.height
+        if left_height == right_height:
+            # on a tie, pick the grandchild on the same side as y so a
+            # single rotation is used (a double would unbalance y)
+            x = y.left if y is z.left else y.right
+        else:
+            x = y.left if left_height > right_height else y.right
+        _DISPATCH[determine_case(x, y, z)](y, z)
 
-        raise NotImplementedError("Unexpected restructuring case")
+    def rebalance_insert(self, path):
+        """
+        Restore the AVL invariant after an insert
 
-    def rebalance_insert(self):
-        x = self
-        if not x.parent:
-            return
-        y = x.parent
-        if not y.parent:
-            return
-        z = y.parent
-        while (not z.unbalanced()) and z.parent:
-            (x, y, z) = (y, z, z.parent)
+        Unwinds the recorded insertion path from the leaf's parent back to
+        the root, updating each ancestor's height in O(1). At most one
+        (possibly double) rotation is needed, after which the walk stops.
+        The balanced check is inlined on the cached child heights so the
+        common no-rotation iteration stays small.
 
-        if not z.unbalanced():
+        :param path: list of ancestors of the inserted node, root first
+        """
+        for ancestor in reversed(path):
+            left_height = ancestor.left.height
+            right_height = ancestor.right.height
+            balance_factor = left_height - right_height
+            ancestor.height = (left_height if left_height > right_height else right_height) + 1
+            if -2 < balance_factor < 2:
+                continue
+            Node._do_rotations(ancestor)
             return
 
-        self.balance(x, y, z)
-        # and finally
-        ...
-
     def rebalance_delete(self):
+        """
+        Restore the AVL invariant after a delete
+
+        Runs on the deepest node whose subtree changed and walks up to the
+        root, updating heights in O(1) and rotating at every unbalanced
+        ancestor (a delete can require a rotation per level). As in
+        rebalance_insert, the balanced check is inlined on cached heights.
+        """
         z = self
-        while (not z.unbalanced()) and z.parent:
+        while z is not _NIL:
+            left_height = z.left.height
+            right_height = z.right.height
+            balance_factor = left_height - right_height
+            z.height = (left_height if left_height > right_height else right_height) + 1
+            if balance_factor >= 2 or balance_factor <= -2:
+                Node._do_rotations(z)
             z = z.parent
 
-        y = z.get_highest_child()
-        x = y.get_highest_child()
-
-        if not z.unbalanced():
-            return
 
-        self.balance(x, y, z)
-        # and finally
-        ...
+# Shared sentinel leaf, the red-black `T.nil` trick applied to AVL: every
+# missing child and the root's parent point at _NIL instead of None, so the
+# hot loops compare nodes with `is _NIL` and every height read is
+# unconditional (_NIL.height stays 0). Nothing ever reads _NIL's other
+# fields, so stray parent writes to it are harmless.
+_NIL = object.__new__(Node)
+_NIL.left = _NIL
+_NIL.right = _NIL
+_NIL.parent = _NIL
+_NIL.data = object()
+_NIL.height = 0
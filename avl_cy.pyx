@@ -0,0 +1,392 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""
+Cython port of the AVL tree's computational core
+
+Nodes are cdef-class instances with typed left/right/parent fields, so
+structural navigation compiles to plain C struct loads instead of Python
+attribute dispatch; key comparisons stay generic Python. The API mirrors
+AVL_tree.Node (lookup, insert, delete, rotations, heights, in-order) -
+drawing and the remaining traversals live in the pure-Python module.
+
+Build in place with:
+
+    cythonize -i avl_cy.pyx
+"""
+
+
+cdef class Node:
+    """
+    Tree node: left and right child + data which can be any object
+    """
+
+    cdef public Node left
+    cdef public Node right
+    cdef public Node parent
+    cdef public object data
+    cdef public int height
+
+    def __cinit__(self, data):
+        self.data = data
+        self.height = 1
+
+    cdef Node _new_node(self, data):
+        # overridden by subclasses so inserts create nodes of the same type
+        return Node(data)
+
+    cdef void _set_payload(self, data):
+        self.data = data
+
+    cdef void _swap_payload(self, Node other):
+        self.data, other.data = other.data, self.data
+
+    cdef void _copy_payload(self, Node other):
+        self.data = other.data
+
+    cdef void _fix_height(self):
+        cdef int left_height = self.left.height if self.left is not None else 0
+        cdef int right_height = self.right.height if self.right is not None else 0
+        self.height = (left_height if left_height > right_height else right_height) + 1
+
+    cdef void _fix_heights_upward(self):
+        cdef Node node = self
+        while node is not None:
+            node._fix_height()
+            node = node.parent
+
+    cpdef Node lookup(self, data):
+        """
+        Lookup node containing data
+
+        :param data: node data object to look up
+        :returns: node if found
+        :raise ValueError: data is not in tree
+        """
+        cdef Node node = self
+        while node is not None:
+            if data < node.data:
+                node = node.left
+            elif data > node.data:
+                node = node.right
+            else:
+                return node
+
+        raise ValueError(f"{data} is not in tree")
+
+    cpdef insert(self, data):
+        """
+        Insert new node with data
+
+        :param data: node data object to insert
+        :raises ValueError: data is already present in the tree
+        """
+        cdef Node node, child
+        if self.data is None:
+            self._set_payload(data)
+            return
+
+        node = self
+        while True:
+            if data < node.data:
+                if node.left is None:
+                    child = self._new_node(data)
+                    child.parent = node
+                    node.left = child
+                    break
+                node = node.left
+            elif data > node.data:
+                if node.right is None:
+                    child = self._new_node(data)
+                    child.parent = node
+                    node.right = child
+                    break
+                node = node.right
+            else:
+                raise ValueError("data is already present in the tree")
+
+        node._rebalance_up(True)
+
+    cpdef delete(self, data):
+        """
+        Delete node containing data
+
+        :param data: node's content to delete
+        :raise ValueError: data is not in tree
+        """
+        cdef Node node = self.lookup(data)
+        cdef int count = (node.left is not None) + (node.right is not None)
+        if count == 0:
+            node._no_children_delete()
+        elif count == 1:
+            node._one_child_delete()
+        else:
+            node._two_children_delete()
+
+    cdef void _no_children_delete(self):
+        cdef Node parent = self.parent
+        if parent is None:
+            return
+        if parent.left is self:
+            parent.left = None
+        else:
+            parent.right = None
+        self.parent = None
+        parent._rebalance_up(False)
+
+    cdef void _one_child_delete(self):
+        cdef Node child = self.left if self.left is not None else self.right
+        self._copy_payload(child)
+        self.left = child.left
+        if self.left is not None:
+            self.left.parent = self
+        self.right = child.right
+        if self.right is not None:
+            self.right.parent = self
+        self._rebalance_up(False)
+
+    cdef void _two_children_delete(self):
+        cdef Node successor = self.right
+        cdef Node successor_left = successor.left
+        cdef Node successor_right, successor_parent
+        while successor_left is not None:
+            successor = successor_left
+            successor_left = successor.left
+        self._copy_payload(successor)
+        successor_right = successor.right
+        if successor.parent is self:
+            self.right = successor_right
+            if successor_right is not None:
+                successor_right.parent = self
+            self._rebalance_up(False)
+            return
+        successor_parent = successor.parent
+        successor_parent.left = successor_right
+        if successor_right is not None:
+            successor_right.parent = successor_parent
+        successor_parent._rebalance_up(False)
+
+    cdef void _rotate_right(self):
+        # swap payloads so this node keeps its identity as the subtree root,
+        # then re-wire the existing nodes; heights of the two touched nodes
+        # are fixed locally, the rebalance walk maintains the ancestors
+        cdef Node left = self.left
+        self._swap_payload(left)
+        self.left = left.left
+        if self.left is not None:
+            self.left.parent = self
+        left.left = left.right
+        left.right = self.right
+        if left.right is not None:
+            left.right.parent = left
+        self.right = left
+        left.parent = self
+        left._fix_height()
+        self._fix_height()
+
+    cdef void _rotate_left(self):
+        cdef Node right = self.right
+        self._swap_payload(right)
+        self.right = right.right
+        if self.right is not None:
+            self.right.parent = self
+        right.right = right.left
+        right.left = self.left
+        if right.left is not None:
+            right.left.parent = right
+        self.left = right
+        right.parent = self
+        right._fix_height()
+        self._fix_height()
+
+    cdef void _restructure(self, int balance_factor):
+        cdef Node y
+        cdef int inner_height, outer_height
+        if balance_factor > 0:
+            y = self.left
+            inner_height = y.right.height if y.right is not None else 0
+            outer_height = y.left.height if y.left is not None else 0
+            if inner_height > outer_height:
+                y._rotate_left()
+            self._rotate_right()
+        else:
+            y = self.right
+            inner_height = y.left.height if y.left is not None else 0
+            outer_height = y.right.height if y.right is not None else 0
+            if inner_height > outer_height:
+                y._rotate_right()
+            self._rotate_left()
+
+    cdef void _rebalance_up(self, bint stop_after_first):
+        # walk to the root fixing heights; an insert needs at most one
+        # restructure, a delete may need one per level
+        cdef Node z = self
+        cdef int left_height, right_height, balance_factor
+        while z is not None:
+            z._fix_height()
+            left_height = z.left.height if z.left is not None else 0
+            right_height = z.right.height if z.right is not None else 0
+            balance_factor = left_height - right_height
+            if balance_factor >= 2 or balance_factor <= -2:
+                z._restructure(balance_factor)
+                if stop_after_first:
+                    return
+            z = z.parent
+
+    cpdef rotate_right(self):
+        """
+        rotate the tree to the right such that this node becomes the right child of the new root
+
+        :raises ValueError: Can't rotate to the right as there is no 'left' node to rotate from
+        """
+        if self.left is None:
+            raise ValueError("Can't rotate to the right as there is no 'left' node to rotate from")
+        self._rotate_right()
+        self._fix_heights_upward()
+
+    cpdef rotate_left(self):
+        """
+        rotate the tree to the left such that this node becomes the left child of the new root
+
+        :raises ValueError: Can't rotate to the left as there is no 'right' node to rotate from
+        """
+        if self.right is None:
+            raise ValueError("Can't rotate to the left as there is no 'right' node to rotate from")
+        self._rotate_left()
+        self._fix_heights_upward()
+
+    cpdef int get_height(self):
+        """
+        Return the height of the subtree rooted at this node
+        """
+        return self.height
+
+    cpdef bint unbalanced(self):
+        """
+        Return True if the subtree rooted at this node is unbalanced
+        """
+        cdef int left_height = self.left.height if self.left is not None else 0
+        cdef int right_height = self.right.height if self.right is not None else 0
+        cdef int balance_factor = left_height - right_height
+        return balance_factor >= 2 or balance_factor <= -2
+
+    cpdef int children_count(self):
+        """
+        Returns the number of children a node has
+        """
+        return (self.left is not None) + (self.right is not None)
+
+    def in_order_traverse(self):
+        """
+        Traverse this node's (sub)tree in-order
+
+        :return: an iterator that traverses the (sub)tree
+        """
+        cdef Node node = self
+        cdef list stack = []
+        while node is not None or stack:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.data
+            node = node.right
+
+
+cdef class IntNode(Node):
+    """
+    Node specialized for C integer keys
+
+    Mirrors data into a typed ikey field so the descent loops compare raw
+    C long longs instead of going through PyObject_RichCompare. The
+    payload hooks keep ikey in sync across rotations and deletes.
+    """
+
+    cdef long long ikey
+
+    def __cinit__(self, data):
+        if data is not None:
+            self.ikey = data
+
+    cdef Node _new_node(self, data):
+        return IntNode(data)
+
+    cdef void _set_payload(self, data):
+        self.data = data
+        self.ikey = data
+
+    cdef void _swap_payload(self, Node other):
+        cdef IntNode o = <IntNode> other
+        self.data, o.data = o.data, self.data
+        self.ikey, o.ikey = o.ikey, self.ikey
+
+    cdef void _copy_payload(self, Node other):
+        cdef IntNode o = <IntNode> other
+        self.data = o.data
+        self.ikey = o.ikey
+
+    cpdef Node lookup(self, data):
+        """
+        Lookup node containing data, comparing C integers
+
+        :param data: integer key to look up
+        :returns: node if found
+        :raise ValueError: data is not in tree
+        """
+        cdef long long key = data
+        cdef IntNode node = self
+        while node is not None:
+            if key < node.ikey:
+                node = <IntNode> node.left
+            elif key > node.ikey:
+                node = <IntNode> node.right
+            else:
+                return node
+
+        raise ValueError(f"{data} is not in tree")
+
+    cpdef insert(self, data):
+        """
+        Insert new node with data, comparing C integers
+
+        :param data: integer key to insert
+        :raises ValueError: data is already present in the tree
+        """
+        cdef long long key
+        cdef IntNode node, child
+        if self.data is None:
+            self._set_payload(data)
+            return
+
+        key = data
+        node = self
+        while True:
+            if key < node.ikey:
+                if node.left is None:
+                    child = IntNode(data)
+                    child.parent = node
+                    node.left = child
+                    break
+                node = <IntNode> node.left
+            elif key > node.ikey:
+                if node.right is None:
+                    child = IntNode(data)
+                    child.parent = node
+                    node.right = child
+                    break
+                node = <IntNode> node.right
+            else:
+                raise ValueError("data is already present in the tree")
+
+        node._rebalance_up(True)
+
+
+def make_tree(dtype, data=None):
+    """
+    Create a tree root whose node class is specialized for the key type
+
+    :param dtype: key type; int picks the C-integer specialized IntNode
+    :param data: optional initial key for the root
+    :return: root node
+    """
+    if dtype is int:
+        return IntNode(data)
+    return Node(data)